@@ -4,11 +4,15 @@ A console-based e-commerce platform with user authentication,
 inventory management, and shopping cart functionality.
 """
 
+import hashlib
+import hmac
+import mmap
+import os
 import re
+import secrets
 import string
-import random
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 
 # ==================== UTILITY FUNCTIONS ====================
@@ -29,52 +33,72 @@ def ensure_accounts_file(data_dir: str) -> str:
     return str(accounts_file)
 
 
+# Warehouse files smaller than this are read in one go; mmap setup costs
+# more than it saves on small files.
+MMAP_THRESHOLD = 64 * 1024
+
+
+# One 'name: price' record. The greedy name runs to the last colon before
+# the next semicolon, matching a split on the item's last colon.
+WAREHOUSE_ITEM_RE = re.compile(rb'([^;]*):\s*([+-]?\d+)\s*(?:;|\Z)')
+
+
+def parse_warehouse_items(buffer, inventory: Dict[str, int]):
+    """
+    Parse 'name: price;' records from a bytes-like buffer into inventory.
+    Tokenizes the whole buffer in a single regex scan.
+    """
+    for match in WAREHOUSE_ITEM_RE.finditer(buffer):
+        name, price = match.groups()
+        inventory[name.decode('utf-8').strip()] = int(price)
+
+
+def find_warehouse_files(data_dir: str) -> List[Path]:
+    """Return all warehouse files in the data directory, in load order."""
+    return sorted(Path(data_dir).glob("warehouse*.txt"))
+
+
+def warehouse_signature(data_dir: str) -> Tuple:
+    """
+    Snapshot the warehouse files for change detection.
+    Returns: ((file_name, mtime_ns, size), ...)
+    """
+    signature = []
+    for warehouse_file in find_warehouse_files(data_dir):
+        stat = warehouse_file.stat()
+        signature.append((warehouse_file.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
 def load_warehouse_inventory(data_dir: str) -> Dict[str, int]:
     """
     Load all warehouse files and create inventory dictionary.
     Returns: {item_name: price}
     """
     inventory = {}
-    warehouse_dir = Path(data_dir)
     
-    # Find all warehouse files
-    warehouse_files = sorted(warehouse_dir.glob("warehouse*.txt"))
-    
-    for warehouse_file in warehouse_files:
-        with open(warehouse_file, 'r', encoding='utf-8') as f:
-            content = f.read().strip()
-            if not content:
+    for warehouse_file in find_warehouse_files(data_dir):
+        with open(warehouse_file, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < MMAP_THRESHOLD:
+                parse_warehouse_items(f.read(), inventory)
                 continue
             
-            # Split by semicolon to get items
-            items = content.split(';')
-            for item in items:
-                item = item.strip()
-                if not item or ':' not in item:
-                    continue
-                
-                # Split by colon to get name and price
-                parts = item.rsplit(':', 1)
-                if len(parts) == 2:
-                    name = parts[0].strip()
-                    try:
-                        price = int(parts[1].strip())
-                        inventory[name] = price
-                    except ValueError:
-                        continue
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                parse_warehouse_items(buffer, inventory)
     
     return inventory
 
 
-def load_accounts(accounts_file: str) -> Dict[str, Dict]:
+def load_accounts(accounts_file: str) -> Tuple[Dict[str, Dict], Dict[str, str]]:
     """
     Load all accounts from accounts.txt.
-    Returns: {username: {email, password, balance}}
+    Returns: ({username: {email, password, balance}}, {email: username})
     """
     accounts = {}
     
     if not Path(accounts_file).exists():
-        return accounts
+        return accounts, {}
     
     with open(accounts_file, 'r', encoding='utf-8') as f:
         for line in f:
@@ -91,34 +115,108 @@ def load_accounts(accounts_file: str) -> Dict[str, Dict]:
                     'balance': float(balance)
                 }
     
-    return accounts
+    email_index = {data['email']: uname for uname, data in accounts.items()}
+    return accounts, email_index
 
 
 def save_accounts(accounts_file: str, accounts: Dict):
-    """Save accounts dictionary to accounts.txt."""
+    """Save accounts dictionary to accounts.txt in a single write."""
+    lines = [', '.join((username, data['email'], data['password'], str(data['balance'])))
+             for username, data in accounts.items()]
     with open(accounts_file, 'w', encoding='utf-8') as f:
-        for username, data in accounts.items():
-            line = f"{username}, {data['email']}, {data['password']}, {data['balance']}\n"
-            f.write(line)
+        f.write('\n'.join(lines) + '\n' if lines else '')
+
+
+# scrypt cost parameters for stored password hashes
+SCRYPT_N, SCRYPT_R, SCRYPT_P = 16384, 8, 1
+SCRYPT_SALT_BYTES, SCRYPT_HASH_BYTES = 16, 64
+
+
+def hash_password(password: str) -> str:
+    """
+    Hash a password with scrypt and a random salt.
+    Returns: 'scrypt$<salt_hex>$<hash_hex>'
+    """
+    salt = secrets.token_bytes(SCRYPT_SALT_BYTES)
+    digest = hashlib.scrypt(password.encode('utf-8'), salt=salt,
+                            n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P, dklen=SCRYPT_HASH_BYTES)
+    return f"scrypt${salt.hex()}${digest.hex()}"
+
+
+def parse_password_hash(stored: str) -> Optional[Tuple[bytes, bytes]]:
+    """
+    Parse a stored 'scrypt$<salt_hex>$<hash_hex>' value.
+    Returns (salt, hash), or None if the value is not a well-formed hash.
+    """
+    parts = stored.split('$')
+    if len(parts) != 3 or parts[0] != 'scrypt':
+        return None
+    
+    try:
+        salt, digest = bytes.fromhex(parts[1]), bytes.fromhex(parts[2])
+    except ValueError:
+        return None
+    
+    if len(salt) != SCRYPT_SALT_BYTES or len(digest) != SCRYPT_HASH_BYTES:
+        return None
+    return salt, digest
+
+
+def check_password(password: str, stored: str) -> bool:
+    """
+    Check a password against a stored hash in constant time.
+    Plaintext passwords from older accounts files are still accepted.
+    """
+    parsed = parse_password_hash(stored)
+    if parsed is None:
+        return hmac.compare_digest(password.encode('utf-8'), stored.encode('utf-8'))
+    
+    salt, expected = parsed
+    digest = hashlib.scrypt(password.encode('utf-8'), salt=salt,
+                            n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P, dklen=SCRYPT_HASH_BYTES)
+    return hmac.compare_digest(digest, expected)
 
 
 def generate_password(length: int = 16) -> str:
     """Generate a strong password with uppercase, lowercase, digit, and special char."""
     required_chars = [
-        random.choice(string.ascii_lowercase),
-        random.choice(string.ascii_uppercase),
-        random.choice(string.digits),
-        random.choice(string.punctuation)
+        secrets.choice(string.ascii_lowercase),
+        secrets.choice(string.ascii_uppercase),
+        secrets.choice(string.digits),
+        secrets.choice(string.punctuation)
     ]
     
     remaining = length - len(required_chars)
     all_chars = string.ascii_letters + string.digits + string.punctuation
-    required_chars.extend(random.choice(all_chars) for _ in range(remaining))
+    required_chars.extend(secrets.choice(all_chars) for _ in range(remaining))
     
-    random.shuffle(required_chars)
+    secrets.SystemRandom().shuffle(required_chars)
     return ''.join(required_chars)
 
 
+# Character class bits tracked by validate_password
+LOWER, UPPER, DIGIT, SPECIAL = 1, 2, 4, 8
+ALL_CHAR_CLASSES = LOWER | UPPER | DIGIT | SPECIAL
+PUNCTUATION = frozenset(string.punctuation)
+
+
+def classify_char(c: str) -> int:
+    """Return the character class bit for a single password character."""
+    if c.islower():
+        return LOWER
+    if c.isupper():
+        return UPPER
+    if c.isdigit():
+        return DIGIT
+    if c in PUNCTUATION:
+        return SPECIAL
+    return 0
+
+
+# Precomputed classes for ASCII; other characters fall back to classify_char
+ASCII_CHAR_CLASSES = {chr(i): classify_char(chr(i)) for i in range(128)}
+
+
 def validate_password(password: str) -> bool:
     """
     Validate password strength.
@@ -127,28 +225,55 @@ def validate_password(password: str) -> bool:
     if len(password) < 16:
         return False
     
-    has_lower = any(c.islower() for c in password)
-    has_upper = any(c.isupper() for c in password)
-    has_digit = any(c.isdigit() for c in password)
-    has_special = any(c in string.punctuation for c in password)
+    # Single pass, stopping as soon as every class has been seen
+    seen = 0
+    for c in password:
+        char_class = ASCII_CHAR_CLASSES.get(c)
+        seen |= classify_char(c) if char_class is None else char_class
+        if seen == ALL_CHAR_CLASSES:
+            return True
     
-    return has_lower and has_upper and has_digit and has_special
+    return False
+
+
+# Multi-word queries on indexes at least this large test the rarest term
+# first; term frequencies are estimated from a sample of this many items.
+SEARCH_SAMPLE_SIZE = 256
 
 
-def search_inventory(query: str, inventory: Dict[str, int]) -> List[str]:
+def build_search_index(inventory: Dict[str, int]) -> List[Tuple[str, str]]:
     """
-    Search inventory using regex patterns.
-    Returns list of matching item names.
+    Pair each item name with its lowercase form for case-insensitive search.
+    Returns: [(item_name, item_name_lower)]
     """
-    search_terms = query.split()
-    regex_patterns = [re.compile(re.escape(term), re.IGNORECASE) for term in search_terms]
+    return [(item_name, item_name.lower()) for item_name in inventory]
+
+
+def search_inventory(query: str, search_index: List[Tuple[str, str]]) -> List[str]:
+    """
+    Search inventory using case-insensitive substring matching.
+    Returns list of item names containing every query term.
+    """
+    search_terms = tuple(term.lower() for term in query.split())
     
-    search_output = []
-    for item_name in inventory.keys():
-        if all(pattern.search(item_name) for pattern in regex_patterns):
-            search_output.append(item_name)
+    # Put the most selective term first so all()/and short-circuit sooner
+    if len(search_terms) > 1 and len(search_index) >= SEARCH_SAMPLE_SIZE:
+        sample = search_index[::len(search_index) // SEARCH_SAMPLE_SIZE]
+        search_terms = tuple(sorted(search_terms, key=lambda term: sum(
+            1 for _, item_lower in sample if term in item_lower)))
     
-    return search_output
+    # One- and two-word queries are the common case; test them without all()
+    if len(search_terms) == 1:
+        term = search_terms[0]
+        return [item_name for item_name, item_lower in search_index
+                if term in item_lower]
+    if len(search_terms) == 2:
+        first, second = search_terms
+        return [item_name for item_name, item_lower in search_index
+                if first in item_lower and second in item_lower]
+    
+    return [item_name for item_name, item_lower in search_index
+            if all(term in item_lower for term in search_terms)]
 
 
 def format_currency(amount: float) -> str:
@@ -171,7 +296,8 @@ def get_valid_input(prompt: str, input_type=str, condition=None) -> any:
 
 # ==================== LOGIN SECTION ====================
 
-def login_menu(accounts: Dict, accounts_file: str) -> Optional[str]:
+def login_menu(accounts: Dict, email_index: Dict[str, str],
+               accounts_file: str) -> Optional[str]:
     """
     Main login menu. Returns username if successful, None if exit.
     """
@@ -186,11 +312,11 @@ def login_menu(accounts: Dict, accounts_file: str) -> Optional[str]:
         choice = input("\nSelect option (1-3): ").strip()
         
         if choice == '1':
-            username = sign_in(accounts)
+            username = sign_in(accounts, email_index, accounts_file)
             if username:
                 return username
         elif choice == '2':
-            sign_up(accounts, accounts_file)
+            sign_up(accounts, email_index, accounts_file)
         elif choice == '3':
             print("\nThank you for visiting! Goodbye!")
             return None
@@ -198,17 +324,17 @@ def login_menu(accounts: Dict, accounts_file: str) -> Optional[str]:
             print("Invalid option. Please try again.")
 
 
-def sign_in(accounts: Dict) -> Optional[str]:
+def sign_in(accounts: Dict, email_index: Dict[str, str],
+            accounts_file: str) -> Optional[str]:
     """Sign in existing user. Returns username if successful, None otherwise."""
     print("\n--- SIGN IN ---")
     username_or_email = input("Enter username or email: ").strip()
     
-    # Find account by username or email
-    account_username = None
-    for uname, data in accounts.items():
-        if uname == username_or_email or data['email'] == username_or_email:
-            account_username = uname
-            break
+    # Find account by username first (the common case), then by email
+    if username_or_email in accounts:
+        account_username = username_or_email
+    else:
+        account_username = email_index.get(username_or_email)
     
     if not account_username:
         print("ERROR: Username or email not found.")
@@ -216,7 +342,12 @@ def sign_in(accounts: Dict) -> Optional[str]:
     
     password = input("Enter password: ").strip()
     
-    if accounts[account_username]['password'] == password:
+    stored = accounts[account_username]['password']
+    if check_password(password, stored):
+        # Upgrade plaintext passwords from older accounts files
+        if parse_password_hash(stored) is None:
+            accounts[account_username]['password'] = hash_password(password)
+            save_accounts(accounts_file, accounts)
         print(f"\nWelcome back, {account_username}!")
         return account_username
     else:
@@ -224,7 +355,7 @@ def sign_in(accounts: Dict) -> Optional[str]:
         return None
 
 
-def sign_up(accounts: Dict, accounts_file: str):
+def sign_up(accounts: Dict, email_index: Dict[str, str], accounts_file: str):
     """Create new user account."""
     print("\n--- SIGN UP ---")
     
@@ -245,7 +376,7 @@ def sign_up(accounts: Dict, accounts_file: str):
         if not email:
             print("Email cannot be empty.")
             continue
-        if any(data['email'] == email for data in accounts.values()):
+        if email in email_index:
             print("Email already registered.")
             continue
         break
@@ -277,9 +408,10 @@ def sign_up(accounts: Dict, accounts_file: str):
     # Save account
     accounts[username] = {
         'email': email,
-        'password': password,
+        'password': hash_password(password),
         'balance': 0.0
     }
+    email_index[email] = username
     
     save_accounts(accounts_file, accounts)
     print(f"\nAccount created successfully! Welcome, {username}!")
@@ -287,8 +419,9 @@ def sign_up(accounts: Dict, accounts_file: str):
 
 # ==================== RUN SECTION ====================
 
-def run_menu(username: str, accounts: Dict, accounts_file: str, 
-             inventory: Dict[str, int]) -> bool:
+def run_menu(username: str, accounts: Dict, email_index: Dict[str, str],
+             accounts_file: str, inventory: Dict[str, int],
+             search_index: List[Tuple[str, str]], sorted_items: List[str]) -> bool:
     """
     Main run menu. Returns True to continue, False to exit.
     """
@@ -306,9 +439,10 @@ def run_menu(username: str, accounts: Dict, accounts_file: str,
         if choice == '1':
             fund_wallet(username, accounts, accounts_file)
         elif choice == '2':
-            purchase_menu(username, accounts, accounts_file, inventory)
+            purchase_menu(username, accounts, accounts_file, inventory,
+                          search_index, sorted_items)
         elif choice == '3':
-            manage_account(username, accounts, accounts_file)
+            manage_account(username, accounts, email_index, accounts_file)
         elif choice == '4':
             exit_program(username)
             return False
@@ -323,6 +457,7 @@ def fund_wallet(username: str, accounts: Dict, accounts_file: str):
     print("\n--- FUND WALLET ---")
     
     funding_options = [10000, 20000, 50000, 100000]
+    funded = False  # Balance changes are saved once on leaving this menu
     
     while True:
         print("\nFunding Options:")
@@ -336,20 +471,23 @@ def fund_wallet(username: str, accounts: Dict, accounts_file: str):
             idx = int(choice) - 1
             amount = funding_options[idx]
             accounts[username]['balance'] += amount
-            save_accounts(accounts_file, accounts)
+            funded = True
             print(f"Funded {format_currency(amount)}")
             print(f"New balance: {format_currency(accounts[username]['balance'])}")
         elif choice == '5':
             break
         else:
             print("Invalid option.")
+    
+    if funded:
+        save_accounts(accounts_file, accounts)
 
 
 def purchase_menu(username: str, accounts: Dict, accounts_file: str, 
-                  inventory: Dict[str, int]):
+                  inventory: Dict[str, int], search_index: List[Tuple[str, str]],
+                  sorted_items: List[str]):
     """Main purchase menu."""
-    cart = {}  # {item_name: quantity}
-    inventory_copy = inventory.copy()  # Local copy for this session
+    cart = {}  # {item_name: quantity}; inventory (prices) is never modified
     
     while True:
         print("\n" + "="*50)
@@ -363,18 +501,19 @@ def purchase_menu(username: str, accounts: Dict, accounts_file: str,
         choice = input("\nSelect option (1-4): ").strip()
         
         if choice == '1':
-            search_items(cart, inventory_copy)
+            search_items(cart, inventory, search_index)
         elif choice == '2':
-            manage_cart(cart, inventory_copy)
+            manage_cart(cart, inventory, sorted_items)
         elif choice == '3':
-            checkout(username, accounts, accounts_file, cart, inventory_copy)
+            checkout(username, accounts, accounts_file, cart, inventory)
         elif choice == '4':
             break
         else:
             print("Invalid option.")
 
 
-def search_items(cart: Dict, inventory: Dict[str, int]):
+def search_items(cart: Dict, inventory: Dict[str, int],
+                 search_index: List[Tuple[str, str]]):
     """Search and add items to cart."""
     while True:
         query = input("\nEnter search query (or 'back' to return): ").strip()
@@ -382,7 +521,7 @@ def search_items(cart: Dict, inventory: Dict[str, int]):
         if query.lower() == 'back':
             break
         
-        results = search_inventory(query, inventory)
+        results = search_inventory(query, search_index)
         
         if not results:
             print("No items found matching your search.")
@@ -433,7 +572,6 @@ def add_items_to_cart(cart: Dict, items: List[str], inventory: Dict[str, int]):
                     cart[item] = 0
                 
                 cart[item] += quantity
-                inventory[item] -= quantity
                 print(f"Added {quantity} x {item} to cart")
                 break
             else:
@@ -442,7 +580,7 @@ def add_items_to_cart(cart: Dict, items: List[str], inventory: Dict[str, int]):
             print("Invalid input.")
 
 
-def manage_cart(cart: Dict, inventory: Dict[str, int]):
+def manage_cart(cart: Dict, inventory: Dict[str, int], sorted_items: List[str]):
     """Manage shopping cart."""
     while True:
         print("\n" + "="*50)
@@ -454,7 +592,7 @@ def manage_cart(cart: Dict, inventory: Dict[str, int]):
         else:
             print("\nCart Contents:")
             for i, (item, qty) in enumerate(cart.items(), 1):
-                price = inventory.get(item)  # Price from inventory copy
+                price = inventory.get(item)
                 if price is None:
                     continue
                 item_total = price * qty
@@ -473,14 +611,10 @@ def manage_cart(cart: Dict, inventory: Dict[str, int]):
         if choice == '1':
             continue
         elif choice == '2':
-            add_items_menu(cart, inventory)
+            add_items_menu(cart, inventory, sorted_items)
         elif choice == '3':
-            remove_items_from_cart(cart, inventory)
+            remove_items_from_cart(cart)
         elif choice == '4':
-            # Restore inventory
-            for item, qty in cart.items():
-                if item in inventory:
-                    inventory[item] += qty
             cart.clear()
             print("Cart cleared.")
         elif choice == '5':
@@ -489,10 +623,10 @@ def manage_cart(cart: Dict, inventory: Dict[str, int]):
             print("Invalid option.")
 
 
-def add_items_menu(cart: Dict, inventory: Dict[str, int]):
-    """Menu to add items to cart."""
+def add_items_menu(cart: Dict, inventory: Dict[str, int], sorted_items: List[str]):
+    """Menu to add items to cart. Items are listed alphabetically."""
     print("\nAvailable Items:")
-    items = list(inventory.keys())
+    items = sorted_items
     for i, item in enumerate(items, 1):
         print(f"{i}. {item} - {format_currency(inventory[item])}")
     
@@ -508,7 +642,6 @@ def add_items_menu(cart: Dict, inventory: Dict[str, int]):
                 if item not in cart:
                     cart[item] = 0
                 cart[item] += quantity
-                inventory[item] -= quantity
                 print(f"Added {quantity} x {item} to cart")
         else:
             print("Invalid item number.")
@@ -516,7 +649,7 @@ def add_items_menu(cart: Dict, inventory: Dict[str, int]):
         print("Invalid input.")
 
 
-def remove_items_from_cart(cart: Dict, inventory: Dict[str, int]):
+def remove_items_from_cart(cart: Dict):
     """Remove items from cart."""
     if not cart:
         print("Cart is empty.")
@@ -537,7 +670,6 @@ def remove_items_from_cart(cart: Dict, inventory: Dict[str, int]):
             
             if qty_to_remove > 0 and qty_to_remove <= cart[item]:
                 cart[item] -= qty_to_remove
-                inventory[item] += qty_to_remove
                 if cart[item] == 0:
                     del cart[item]
                 print("Item removed from cart.")
@@ -593,7 +725,8 @@ def checkout(username: str, accounts: Dict, accounts_file: str,
 
 # ==================== ACCOUNT MANAGEMENT ====================
 
-def manage_account(username: str, accounts: Dict, accounts_file: str):
+def manage_account(username: str, accounts: Dict, email_index: Dict[str, str],
+                   accounts_file: str):
     """Manage user account."""
     while True:
         print("\n" + "="*50)
@@ -611,9 +744,9 @@ def manage_account(username: str, accounts: Dict, accounts_file: str):
         choice = input("\nSelect option (1-8): ").strip()
         
         if choice == '1':
-            username = change_username(username, accounts, accounts_file)
+            username = change_username(username, accounts, email_index, accounts_file)
         elif choice == '2':
-            change_email(username, accounts, accounts_file)
+            change_email(username, accounts, email_index, accounts_file)
         elif choice == '3':
             change_password(username, accounts, accounts_file)
         elif choice == '4':
@@ -621,7 +754,7 @@ def manage_account(username: str, accounts: Dict, accounts_file: str):
         elif choice == '5':
             reset_balance(username, accounts, accounts_file)
         elif choice == '6':
-            if delete_account(username, accounts, accounts_file):
+            if delete_account(username, accounts, email_index, accounts_file):
                 return username  # Signal to logout
         elif choice == '7':
             return username  # Signal to logout
@@ -634,10 +767,11 @@ def manage_account(username: str, accounts: Dict, accounts_file: str):
 def verify_password(username: str, accounts: Dict) -> bool:
     """Verify user password."""
     password = input("Enter your password to verify: ").strip()
-    return accounts[username]['password'] == password
+    return check_password(password, accounts[username]['password'])
 
 
-def change_username(username: str, accounts: Dict, accounts_file: str) -> str:
+def change_username(username: str, accounts: Dict, email_index: Dict[str, str],
+                    accounts_file: str) -> str:
     """Change username."""
     print("\n--- CHANGE USERNAME ---")
     
@@ -656,12 +790,14 @@ def change_username(username: str, accounts: Dict, accounts_file: str) -> str:
         break
     
     accounts[new_username] = accounts.pop(username)
+    email_index[accounts[new_username]['email']] = new_username
     save_accounts(accounts_file, accounts)
     print(f"Username changed to {new_username}")
     return new_username
 
 
-def change_email(username: str, accounts: Dict, accounts_file: str):
+def change_email(username: str, accounts: Dict, email_index: Dict[str, str],
+                 accounts_file: str):
     """Change email."""
     print("\n--- CHANGE EMAIL ---")
     
@@ -674,13 +810,16 @@ def change_email(username: str, accounts: Dict, accounts_file: str):
         if not new_email:
             print("Email cannot be empty.")
             continue
-        if any(data['email'] == new_email for uname, data in accounts.items() if uname != username):
+        if email_index.get(new_email, username) != username:
             print("Email already registered.")
             continue
         break
     
-    accounts[username]['email'] = new_email
-    save_accounts(accounts_file, accounts)
+    if new_email != accounts[username]['email']:
+        del email_index[accounts[username]['email']]
+        email_index[new_email] = username
+        accounts[username]['email'] = new_email
+        save_accounts(accounts_file, accounts)
     print(f"Email changed to {new_email}")
 
 
@@ -689,7 +828,7 @@ def change_password(username: str, accounts: Dict, accounts_file: str):
     print("\n--- CHANGE PASSWORD ---")
     
     old_password = input("Enter current password: ").strip()
-    if accounts[username]['password'] != old_password:
+    if not check_password(old_password, accounts[username]['password']):
         print("ERROR: Incorrect password.")
         return
     
@@ -700,7 +839,7 @@ def change_password(username: str, accounts: Dict, accounts_file: str):
         else:
             print("Password does not meet requirements.")
     
-    accounts[username]['password'] = new_password
+    accounts[username]['password'] = hash_password(new_password)
     save_accounts(accounts_file, accounts)
     print("Password changed successfully.")
 
@@ -729,12 +868,14 @@ def reset_balance(username: str, accounts: Dict, accounts_file: str):
     
     confirm = input("Are you sure you want to reset your balance to zero? (yes/no): ").strip().lower()
     if confirm == 'yes':
-        accounts[username]['balance'] = 0.0
-        save_accounts(accounts_file, accounts)
+        if accounts[username]['balance'] != 0.0:
+            accounts[username]['balance'] = 0.0
+            save_accounts(accounts_file, accounts)
         print("Balance reset to zero.")
 
 
-def delete_account(username: str, accounts: Dict, accounts_file: str) -> bool:
+def delete_account(username: str, accounts: Dict, email_index: Dict[str, str],
+                   accounts_file: str) -> bool:
     """Delete user account. Returns True if deleted."""
     print("\n--- DELETE ACCOUNT ---")
     
@@ -744,6 +885,7 @@ def delete_account(username: str, accounts: Dict, accounts_file: str) -> bool:
     
     confirm = input("Are you sure you want to delete your account? This cannot be undone. (yes/no): ").strip().lower()
     if confirm == 'yes':
+        del email_index[accounts[username]['email']]
         del accounts[username]
         save_accounts(accounts_file, accounts)
         print("Account deleted successfully.")
@@ -767,31 +909,44 @@ def main():
     accounts_file = ensure_accounts_file(data_dir)
     
     # Load data
-    accounts = load_accounts(accounts_file)
+    accounts, email_index = load_accounts(accounts_file)
+    inventory_signature = warehouse_signature(data_dir)
     inventory = load_warehouse_inventory(data_dir)
     
     if not inventory:
         print("ERROR: No inventory items found.")
         return
     
-    # Login
-    username = login_menu(accounts, accounts_file)
-    if not username:
-        return
+    # Item names never change after loading, so these are built per load
+    search_index = build_search_index(inventory)
+    sorted_items = sorted(inventory)
     
-    # Main application loop
     while True:
-        continue_app = run_menu(username, accounts, accounts_file, inventory)
-        if not continue_app:
+        # Login
+        username = login_menu(accounts, email_index, accounts_file)
+        if not username:
             break
-    
-    # Check if user deleted account or logged out
-    if username not in accounts:
-        print("\nAccount deleted. Returning to login...")
-        main()
-    else:
-        print("\nReturning to login...")
-        main()
+        
+        # Main application loop
+        while run_menu(username, accounts, email_index, accounts_file,
+                       inventory, search_index, sorted_items):
+            pass
+        
+        # Check if user deleted account or logged out
+        if username not in accounts:
+            print("\nAccount deleted. Returning to login...")
+        else:
+            print("\nReturning to login...")
+        
+        # Reparse warehouse files only if they changed during the session
+        signature = warehouse_signature(data_dir)
+        if signature != inventory_signature:
+            reloaded = load_warehouse_inventory(data_dir)
+            if reloaded:
+                inventory = reloaded
+                search_index = build_search_index(inventory)
+                sorted_items = sorted(inventory)
+            inventory_signature = signature
 
 
 if __name__ == "__main__":
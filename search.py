@@ -1,51 +1,80 @@
 """
 Search functionality module for the e-commerce application.
-This module contains the regex-based search algorithm for inventory items.
+This module contains the substring-based search algorithm for inventory items.
 """
 
-import re
 
+def build_search_index(inventory: list[str]) -> list[tuple[str, str]]:
+    """
+    Pair each inventory item with its lowercase form.
+    
+    Building the index once lets repeated searches over the same inventory
+    skip case-folding every item name on each query.
+    
+    Args:
+        inventory: List of item names to index
+        
+    Returns:
+        List of (item_name, item_name_lower) tuples
+    """
+    return [(item, item.lower()) for item in inventory]
 
-def search_inventory(query: str, inventory: list[str]) -> list[str]:
+
+# Multi-word queries on indexes at least this large test the rarest term
+# first; term frequencies are estimated from a sample of this many items.
+SEARCH_SAMPLE_SIZE: int = 256
+
+
+def search_inventory(query: str, search_index: list[tuple[str, str]]) -> list[str]:
     """
-    Search for items in inventory using regex pattern matching.
+    Search for items in inventory using case-insensitive substring matching.
     
     The algorithm:
-    1. Splits the user query into individual words
-    2. Creates case-insensitive regex patterns for each word
-    3. Filters inventory by checking if all patterns match each item
+    1. Splits the user query into individual lowercase words
+    2. On large indexes, orders the words from rarest to most common so
+       non-matching items are rejected after as few tests as possible
+    3. Filters the index by checking if every word occurs in each lowercase item
     4. Returns matching items
     
     Args:
         query: The user's search query string
-        inventory: List of item names to search through
+        search_index: Index built by build_search_index()
         
     Returns:
         List of item names that match all search terms
         
     Example:
         >>> inventory = ["Apple iPhone 14", "Samsung Galaxy S23", "Apple Watch Series 8"]
-        >>> search_inventory("Apple Watch", inventory)
+        >>> search_inventory("Apple Watch", build_search_index(inventory))
         ['Apple Watch Series 8']
     """
-    # Step 1: Split the user query into individual words
-    search_terms: list[str] = query.split()
+    # Step 1: Split the user query into individual lowercase words
+    search_terms: tuple[str, ...] = tuple(term.lower() for term in query.split())
     
-    # Step 2: Create case-insensitive regex patterns for each word
-    regex_patterns: list[re.Pattern[str]] = [
-        re.compile(re.escape(term), re.IGNORECASE) 
-        for term in search_terms
-    ]
+    # Step 2: Estimate each term's frequency on an evenly spaced sample and
+    # test the rarest term first
+    if len(search_terms) > 1 and len(search_index) >= SEARCH_SAMPLE_SIZE:
+        sample = search_index[::len(search_index) // SEARCH_SAMPLE_SIZE]
+        search_terms = tuple(sorted(search_terms, key=lambda term: sum(
+            1 for _, item_lower in sample if term in item_lower)))
     
-    # Step 3: Filter inventory items based on the regex patterns
-    search_output: list[str] = []
-    for item in inventory:
-        # Check if all patterns match the current item
-        if all(pattern.search(item) for pattern in regex_patterns):
-            search_output.append(item)
+    # Step 3 & 4: Keep items whose lowercase name contains every term.
+    # One- and two-word queries are the common case, so they get dedicated
+    # loops that skip the all() generator.
+    if len(search_terms) == 1:
+        term = search_terms[0]
+        return [item for item, item_lower in search_index if term in item_lower]
+    if len(search_terms) == 2:
+        first, second = search_terms
+        return [
+            item for item, item_lower in search_index
+            if first in item_lower and second in item_lower
+        ]
     
-    # Step 4: Return matched items
-    return search_output
+    return [
+        item for item, item_lower in search_index
+        if all(term in item_lower for term in search_terms)
+    ]
 
 
 # Example usage and demonstration
@@ -73,12 +102,14 @@ if __name__ == "__main__":
         "nonexistent product"
     ]
     
+    search_index = build_search_index(inventory)
+    
     print("=" * 60)
     print("INVENTORY SEARCH TEST")
     print("=" * 60)
     
     for query in test_queries:
-        results = search_inventory(query, inventory)
+        results = search_inventory(query, search_index)
         print(f"\nQuery: '{query}'")
         if results:
             print(f"Found {len(results)} result(s):")